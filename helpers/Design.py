@@ -1,8 +1,67 @@
 from typing import Dict, Tuple
-from G4Calo import GeometryDescriptor
+from functools import lru_cache, wraps
+import inspect
+import numpy as np
+from G4Calo import GeometryDescriptor, LayerRun
 from Trackers import LAMBDA_INT_CM  # your interaction-length map
 
-def build_ecal_pbwo4_26X0_then_graded_fe_scint_hcal_200cm_v1(
+
+def _memoized_builder(impl):
+    """
+    Builders depend only on their arguments and the LAMBDA_INT_CM table, so the
+    layer runs + specs are cached on (arguments, snapshot of LAMBDA_INT_CM):
+    editing the λ table starts a fresh cache entry instead of returning stale
+    *_lambda specs. The public wrapper only rebuilds a fresh GeometryDescriptor
+    from the cached runs and runs the optional cost tracker, so callers can
+    mutate both results freely. build.cache_clear() / cache_info() are exposed.
+    """
+    sig = inspect.signature(impl)
+    public_sig = sig.replace(parameters=[
+        *sig.parameters.values(),
+        inspect.Parameter("cost_tracker", inspect.Parameter.POSITIONAL_OR_KEYWORD, default=None),
+    ], return_annotation=Tuple[GeometryDescriptor, Dict])
+
+    @lru_cache(maxsize=128)
+    def cached(args: tuple, lambda_table: tuple):
+        return impl(*args)
+
+    @wraps(impl)
+    def build(*args, **kwargs):
+        bound = public_sig.bind(*args, **kwargs)
+        bound.apply_defaults()
+        cost_tracker = bound.arguments.pop("cost_tracker")
+        runs, specs = cached(tuple(bound.arguments.values()), tuple(LAMBDA_INT_CM.items()))
+        gd = GeometryDescriptor()
+        for run in runs:
+            gd.addLayerRun(*run)
+        if cost_tracker is not None:
+            # per-run totals are all the tracker needs
+            cost_tracker.add_many(
+                [m for _, mats, _, _ in runs for m in mats],
+                [t * c for ts, _, _, c in runs for t in ts],
+            )
+        return gd, dict(specs)
+
+    build.__name__ = build.__qualname__ = impl.__name__[1:-len("_impl")]
+    build.__signature__ = public_sig
+    build.cache_clear = cached.cache_clear
+    build.cache_info = cached.cache_info
+    return build
+
+
+def _len_and_lambda(gd: GeometryDescriptor) -> Tuple[float, float]:
+    """
+    (length in cm, interaction lengths λ_int) of the stack built so far, as one
+    reduction over its run table: lengths = thickness × count, λ = Σ lengths / λ_I.
+    Raises KeyError for a material without a LAMBDA_INT_CM entry.
+    """
+    runs = gd.as_runs()
+    lengths = np.array([t * c for ts, _, _, c in runs for t in ts])
+    lam_cm = np.array([LAMBDA_INT_CM[m] for _, ms, _, _ in runs for m in ms])
+    return float(lengths.sum()), float((lengths / lam_cm).sum())
+
+
+def _build_ecal_pbwo4_26X0_then_graded_fe_scint_hcal_200cm_v1_impl(
     # --- ECAL ---
     total_X0: float = 26.0,                 # target depth in X0
     X0_cm: float = 0.89,                    # PbWO4 X0 in cm (≈ 0.89 cm)
@@ -15,54 +74,27 @@ def build_ecal_pbwo4_26X0_then_graded_fe_scint_hcal_200cm_v1(
     absorber: str = "G4_Fe",
     active:   str = "G4_POLYSTYRENE",
     sensitive_active_only: bool = True,
-    # optional cost tracker (your Trackers.CostTracker instance or None)
-    cost_tracker=None,
-) -> Tuple[GeometryDescriptor, Dict]:
+) -> Tuple[Tuple[LayerRun, ...], Dict]:
 
     gd = GeometryDescriptor()
 
-    ecal_len_cm  = float(total_X0) * float(X0_cm)     # ~ 26 * 0.89 = 23.14 cm
-    ecal_slice   = ecal_len_cm / int(ecal_slices)
+    ecal_slice = float(total_X0) * float(X0_cm) / int(ecal_slices)   # ~ 26 * 0.89 = 23.14 cm in total
 
-    for _ in range(int(ecal_slices)):
-        gd.addLayer(ecal_slice, ecal_material, True)
-        if cost_tracker is not None:
-            cost_tracker.add(ecal_material, ecal_slice)
+    gd.addLayerRun(ecal_slice, ecal_material, True, int(ecal_slices))
+    ecal_len_cm, ecal_lambda = _len_and_lambda(gd)
 
 
     def add_section(n_pairs: int, t_abs_cm: float, t_act_cm: float) -> None:
-        for _ in range(int(n_pairs)):
-            gd.addLayer(float(t_abs_cm), absorber, False)
-            gd.addLayer(float(t_act_cm), active,   bool(sensitive_active_only))
-            if cost_tracker is not None:
-                cost_tracker.add(absorber, t_abs_cm)
-                cost_tracker.add(active,   t_act_cm)
+        gd.addLayerRun([t_abs_cm, t_act_cm], [absorber, active], [False, sensitive_active_only], n_pairs)
 
     add_section(front_pairs, fe_front, sc_front)
     add_section(mid_pairs,   fe_mid,   sc_mid)
     add_section(back_pairs,  fe_back,  sc_back)
 
-    # lengths
-    hcal_len_cm = (
-        front_pairs * (fe_front + sc_front)
-        + mid_pairs * (fe_mid + sc_mid)
-        + back_pairs * (fe_back + sc_back)
-    )
-    total_len_cm = ecal_len_cm + hcal_len_cm
-
-    # interaction length contribution of ECAL
-    ecal_lambda = ecal_len_cm / float(LAMBDA_INT_CM[ecal_material])
-
-    # interaction-length (λ) accounting for HCAL
-    def lam_pair(t_abs_cm: float, t_act_cm: float) -> float:
-        return (float(t_abs_cm) / float(LAMBDA_INT_CM[absorber])) + \
-               (float(t_act_cm) / float(LAMBDA_INT_CM[active]))
-
-    lam_front = front_pairs * lam_pair(fe_front, sc_front)
-    lam_mid   = mid_pairs   * lam_pair(fe_mid,   sc_mid)
-    lam_back  = back_pairs  * lam_pair(fe_back,  sc_back)
-    hcal_lambda = lam_front + lam_mid + lam_back
-    total_lambda = ecal_lambda + hcal_lambda
+    # lengths and interaction-length (λ) accounting; HCAL = total - ECAL
+    total_len_cm, total_lambda = _len_and_lambda(gd)
+    hcal_len_cm = total_len_cm - ecal_len_cm
+    hcal_lambda = total_lambda - ecal_lambda
 
     specs: Dict[str, float] = {
         # ECAL
@@ -80,13 +112,15 @@ def build_ecal_pbwo4_26X0_then_graded_fe_scint_hcal_200cm_v1(
         "total_lambda": total_lambda,      # ≈ 8.8 λ_int with defaults
     }
 
-    return gd, specs
+    return gd.as_runs(), specs
+
+build_ecal_pbwo4_26X0_then_graded_fe_scint_hcal_200cm_v1 = _memoized_builder(_build_ecal_pbwo4_26X0_then_graded_fe_scint_hcal_200cm_v1_impl)
 
 #--- 2nd design:
 
 # Design.py — Budget-friendly ECAL (Pb/Scint sampling) + graded Fe/Scint HCAL (~200 cm)
 
-def build_pb_scint_ecal_then_graded_fe_scint_hcal_200cm_v2(
+def _build_pb_scint_ecal_then_graded_fe_scint_hcal_200cm_v2_impl(
     # --- ECAL: Pb/Scint sampling (fine sampling, ~24 cm total, ~21–22 X0)
     ecal_pairs: int = 60,          # 60 × (0.20 Pb + 0.20 Sc) → ~24.0 cm ECAL
     pb_per_pair_cm: float = 0.20,  # lead per period (cm)
@@ -100,8 +134,7 @@ def build_pb_scint_ecal_then_graded_fe_scint_hcal_200cm_v2(
     absorber: str = "G4_Fe",
     active:   str = "G4_POLYSTYRENE",
     sensitive_active_only: bool = True,
-    cost_tracker=None,
-) -> Tuple[GeometryDescriptor, Dict]:
+) -> Tuple[Tuple[LayerRun, ...], Dict]:
     """
     2.0 m hybrid design tuned for 1–100 GeV, ~50% π± / 50% γ.
       • ECAL: fine Pb/Scint sampling (~24 cm total), much cheaper than PbWO4.
@@ -117,37 +150,22 @@ def build_pb_scint_ecal_then_graded_fe_scint_hcal_200cm_v2(
     # ---------------------------
     # ECAL (Pb/Scint sampling)
     # ---------------------------
-    for _ in range(int(ecal_pairs)):
-        # absorber (Pb), not sensitive
-        gd.addLayer(float(pb_per_pair_cm), ecal_absorber, False)
-        # active (Scint), sensitive so layer histograms show bars
-        gd.addLayer(float(sc_per_pair_cm), ecal_active, True)
-        if cost_tracker is not None:
-            cost_tracker.add(ecal_absorber, pb_per_pair_cm)
-            cost_tracker.add(ecal_active,   sc_per_pair_cm)
-
-    ecal_len_cm = float(ecal_pairs) * (float(pb_per_pair_cm) + float(sc_per_pair_cm))
+    # absorber (Pb) not sensitive; active (Scint) sensitive so layer histograms show bars
+    gd.addLayerRun([pb_per_pair_cm, sc_per_pair_cm], [ecal_absorber, ecal_active], [False, True], ecal_pairs)
+    ecal_len_cm = gd.total_len_cm
 
     # ---------------------------
     # HCAL (graded Fe/Scint)
     # ---------------------------
     def add_section(n_pairs: int, t_abs_cm: float, t_act_cm: float) -> None:
-        for _ in range(int(n_pairs)):
-            gd.addLayer(float(t_abs_cm), absorber, False)
-            gd.addLayer(float(t_act_cm), active,   bool(sensitive_active_only))
-            if cost_tracker is not None:
-                cost_tracker.add(absorber, t_abs_cm)
-                cost_tracker.add(active,   t_act_cm)
+        gd.addLayerRun([t_abs_cm, t_act_cm], [absorber, active], [False, sensitive_active_only], n_pairs)
 
     add_section(front_pairs, fe_front, sc_front)  # transition: reduces ECAL→HCAL step
     add_section(mid_pairs,   fe_mid,   sc_mid)
     add_section(back_pairs,  fe_back,  sc_back)
 
-    hcal_len_cm = (
-        float(front_pairs) * (float(fe_front) + float(sc_front))
-        + float(mid_pairs) * (float(fe_mid)   + float(sc_mid))
-        + float(back_pairs) * (float(fe_back) + float(sc_back))
-    )
+    total_len_cm = gd.total_len_cm
+    hcal_len_cm = total_len_cm - ecal_len_cm
 
     specs: Dict[str, float] = {
         # ECAL sampling specs
@@ -163,19 +181,21 @@ def build_pb_scint_ecal_then_graded_fe_scint_hcal_200cm_v2(
         "back_pairs":  float(back_pairs),  "fe_back":  float(fe_back),  "sc_back":  float(sc_back),
         "hcal_len_cm": hcal_len_cm,                   # ~174.6 cm
         # Totals
-        "total_len_cm": ecal_len_cm + hcal_len_cm,    # ~198.6 cm
+        "total_len_cm": total_len_cm,                 # ~198.6 cm
         # Convenience for run_batch-style sims: use ECAL scint plate as layer thickness
         "ecal_slice_cm": float(sc_per_pair_cm),
     }
 
-    return gd, specs
+    return gd.as_runs(), specs
+
+build_pb_scint_ecal_then_graded_fe_scint_hcal_200cm_v2 = _memoized_builder(_build_pb_scint_ecal_then_graded_fe_scint_hcal_200cm_v2_impl)
 
 # Design.py — v4.2 triple ECAL with scint end-cap + HCAL transition (no printouts)
 
 from typing import Tuple, Dict, Optional
 from G4Calo import GeometryDescriptor
 
-def build_triple_ecal_then_fe_scint_hcal_2m_v4_2(
+def _build_triple_ecal_then_fe_scint_hcal_2m_v4_2_impl(
     # --- ECAL triple period: [Pb, Scint(sens), PbWO4]
     ecal_pairs: int = 60,
     pb_cm: float = 0.15,
@@ -196,65 +216,39 @@ def build_triple_ecal_then_fe_scint_hcal_2m_v4_2(
 
     # --- Length target shim to hit ~2.00 m exactly (optional)
     target_total_len_cm: float = 200.0,
-
-    # Optional cost tracker (e.g., Trackers.CostTracker) or None
-    cost_tracker: Optional[object] = None,
-) -> Tuple[GeometryDescriptor, Dict]:
+) -> Tuple[Tuple[LayerRun, ...], Dict]:
     gd = GeometryDescriptor()
 
     # ---------------------------
     # ECAL (strict triplets)
     # ---------------------------
-    for _ in range(int(ecal_pairs)):
-        # Pb (passive)
-        gd.addLayer(float(pb_cm),    ecal_pb,    False)
-        # Scint (active)
-        gd.addLayer(float(sc_cm),    ecal_scint, True)
-        # PbWO4 (passive)
-        gd.addLayer(float(pbwo4_cm), ecal_pbwo4, False)
-        if cost_tracker is not None:
-            cost_tracker.add(ecal_pb,    pb_cm)
-            cost_tracker.add(ecal_scint, sc_cm)
-            cost_tracker.add(ecal_pbwo4, pbwo4_cm)
-
-    ecal_len = float(ecal_pairs) * (float(pb_cm) + float(sc_cm) + float(pbwo4_cm))
+    # Pb (passive), Scint (active), PbWO4 (passive)
+    gd.addLayerRun([pb_cm, sc_cm, pbwo4_cm], [ecal_pb, ecal_scint, ecal_pbwo4], [False, True, False], ecal_pairs)
 
     # Optional scint end-cap to avoid absorber→absorber boundary
     if add_scint_endcap:
         gd.addLayer(float(sc_cm), ecal_scint, True)
-        if cost_tracker is not None:
-            cost_tracker.add(ecal_scint, sc_cm)
-        ecal_len += float(sc_cm)
+
+    ecal_len = gd.total_len_cm
 
     # ---------------------------
     # HCAL (transition → mid → back)
     # ---------------------------
     def _add_section(n_pairs: int, t_abs: float, t_act: float) -> None:
-        for _ in range(int(n_pairs)):
-            gd.addLayer(float(t_abs), hcal_absorber, False)
-            gd.addLayer(float(t_act), hcal_active,   bool(sensitive_active_only))
-            if cost_tracker is not None:
-                cost_tracker.add(hcal_absorber, t_abs)
-                cost_tracker.add(hcal_active,   t_act)
+        gd.addLayerRun([t_abs, t_act], [hcal_absorber, hcal_active], [False, sensitive_active_only], n_pairs)
 
     _add_section(trans_pairs, fe_trans, sc_trans)
     _add_section(mid_pairs,   fe_mid,   sc_mid)
     _add_section(back_pairs,  fe_back,  sc_back)
 
-    total_len = (
-        ecal_len
-        + float(trans_pairs) * (float(fe_trans) + float(sc_trans))
-        + float(mid_pairs)   * (float(fe_mid)   + float(sc_mid))
-        + float(back_pairs)  * (float(fe_back)  + float(sc_back))
-    )
+    total_len = gd.total_len_cm
 
     # Optional shim (passive Fe) to reach target_total_len_cm
     leftover = float(target_total_len_cm) - float(total_len)
     if leftover > 1e-6:
         gd.addLayer(float(leftover), hcal_absorber, False)
-        if cost_tracker is not None:
-            cost_tracker.add(hcal_absorber, leftover)
-        total_len += float(leftover)
+
+    total_len = gd.total_len_cm
 
     specs: Dict[str, float] = {
         # ECAL
@@ -272,4 +266,6 @@ def build_triple_ecal_then_fe_scint_hcal_2m_v4_2(
         "ecal_slice_cm": float(sc_cm),
     }
 
-    return gd, specs
+    return gd.as_runs(), specs
+
+build_triple_ecal_then_fe_scint_hcal_2m_v4_2 = _memoized_builder(_build_triple_ecal_then_fe_scint_hcal_2m_v4_2_impl)
@@ -1,6 +1,9 @@
 
+import sys
 from dataclasses import dataclass, field
-from typing import List, Dict, Any
+from itertools import chain
+from typing import List, Dict, Any, Iterable, Tuple, Optional, Union
+import numpy as np
 
 @dataclass
 class Layer:
@@ -8,19 +11,113 @@ class Layer:
     material: str
     sensitive: bool = False
 
+# one run = a period of layers (thicknesses, materials, sensitives) repeated `count` times
+LayerRun = Tuple[Tuple[float, ...], Tuple[str, ...], Tuple[bool, ...], int]
+
+class _LayerStack:
+    """
+    Field descriptor for GeometryDescriptor.layers: assigning a list of Layer
+    replaces the stack, reading returns Layer views of the expanded columns
+    (so eq/repr see the layers, not how they were split into runs).
+    """
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return ()  # dataclass field default
+        thick, mats, sens = obj._expand()
+        return tuple(Layer(t, m, s) for t, m, s in zip(thick.tolist(), mats, sens.tolist()))
+
+    def __set__(self, obj, value: Iterable[Layer]) -> None:
+        obj._runs = []
+        obj._cols = None
+        value = list(value)
+        if value:
+            obj.extend_layers([L.thickness_cm for L in value], [L.material for L in value], [L.sensitive for L in value])
+
 @dataclass
 class GeometryDescriptor:
     area_m2: float = 1.0
-    layers: List[Layer] = field(default_factory=list)
+
+    # layer stack, run-length encoded (a 60-pair Pb/Scint block is one run).
+    # Per-layer columns are expanded on first read and dropped on the next append.
+    _runs: List[LayerRun] = field(default_factory=list, init=False, repr=False, compare=False)
+    _cols: Optional[Tuple[np.ndarray, List[str], np.ndarray]] = field(default=None, init=False, repr=False, compare=False)
+    layers: Tuple[Layer, ...] = _LayerStack()
 
     # Design.py expects exactly this:
     def addLayer(self, thickness_cm: float, material: str, sensitive: bool=False):
-        self.layers.append(Layer(float(thickness_cm), str(material), bool(sensitive)))
+        self.addLayerRun(thickness_cm, material, sensitive, 1)
+
+    def addLayerRun(
+        self,
+        thickness_cm: Union[float, Iterable[float]],
+        material: Union[str, Iterable[str]],
+        sensitive: Union[bool, Iterable[bool]] = False,
+        count: int = 1,
+    ):
+        """
+        Add `count` copies of one layer, or of one period when the arguments are
+        sequences: addLayerRun([1.5, 0.5], ["G4_Fe", "G4_POLYSTYRENE"], [False, True], 50).
+        Scalar material/sensitive are broadcast over the period.
+        """
+        t = tuple(np.atleast_1d(np.asarray(thickness_cm, dtype=np.float64)).tolist())
+        mats = [material] * len(t) if isinstance(material, str) else list(material)
+        m = tuple(sys.intern(str(x)) for x in mats)
+        s = tuple(np.broadcast_to(np.asarray(sensitive, dtype=bool), (len(t),)).tolist())
+        if len(m) != len(t):
+            raise ValueError(f"addLayerRun: {len(t)} thicknesses but {len(m)} materials")
+        count = int(count)
+        if count <= 0 or not t:
+            return
+        if self._runs and self._runs[-1][:3] == (t, m, s):
+            self._runs[-1] = (t, m, s, self._runs[-1][3] + count)
+        else:
+            self._runs.append((t, m, s, count))
+        self._cols = None
+
+    # bulk version of addLayer: the given layers become one run
+    def extend_layers(self, thicknesses_cm: Iterable[float], materials: Iterable[str], sensitives: Iterable[bool]):
+        self.addLayerRun(list(thicknesses_cm), list(materials), list(sensitives), 1)
+
+    # --- run / column access ---
+    def as_runs(self) -> Tuple[LayerRun, ...]:
+        """Immutable RLE view of the stack (e.g. for caching)."""
+        return tuple(self._runs)
+
+    def _expand(self) -> Tuple[np.ndarray, List[str], np.ndarray]:
+        if self._cols is None:
+            self._cols = (
+                np.concatenate([np.tile(t, c) for t, _, _, c in self._runs]) if self._runs else np.zeros(0),
+                list(chain.from_iterable(m * c for _, m, _, c in self._runs)),
+                np.concatenate([np.tile(s, c) for _, _, s, c in self._runs]) if self._runs else np.zeros(0, bool),
+            )
+        return self._cols
+
+    @property
+    def n_layers(self) -> int:
+        return sum(len(t) * c for t, _, _, c in self._runs)
+
+    @property
+    def total_len_cm(self) -> float:
+        return float(sum(sum(t) * c for t, _, _, c in self._runs))
+
+    @property
+    def thickness_cm(self) -> np.ndarray:
+        return self._expand()[0]
+
+    @property
+    def materials(self) -> List[str]:
+        return self._expand()[1]
+
+    @property
+    def sensitive(self) -> np.ndarray:
+        return self._expand()[2]
 
     # handy if Design ever calls this:
     def as_specs(self) -> Dict[str, Any]:
+        thick, mats, sens = self._expand()
         return {
-            "total_len_cm": float(sum(L.thickness_cm for L in self.layers)),
+            "total_len_cm": self.total_len_cm,
             "total_lambda": None,
-            "layers": [{"material": L.material, "thickness_cm": L.thickness_cm, "sensitive": L.sensitive} for L in self.layers],
+            "layers": [{"material": m, "thickness_cm": t, "sensitive": s} for t, m, s in zip(thick.tolist(), mats, sens.tolist())],
         }
@@ -1,7 +1,7 @@
 # Simulations.py — direct calls (no run_batch)
 
-from typing import Optional, Tuple, List
-import os, math, random
+from typing import Optional, Tuple, List, Dict
+import os, math
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -9,6 +9,53 @@ import matplotlib.pyplot as plt
 # direct bridge
 import g4python as g4p
 
+# hit schema returned by the bridge
+_HIT_COLUMNS = ("event", "edep_MeV", "x_mm", "y_mm", "z_mm")
+_FLOAT_COLUMNS = ("edep_MeV", "x_mm", "y_mm", "z_mm")
+
+# optional: jitted layer binning (falls back to np.bincount without numba)
+try:
+    from numba import njit, prange, get_num_threads
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
+
+# below this many hits np.bincount (~1 ms / 100k hits) beats loading/compiling
+# the jitted kernel, so only really large hit sets go to _bin_mean
+_NUMBA_MIN_HITS = 10_000_000
+
+
+if _HAVE_NUMBA:
+    # no fastmath: the layer index must round exactly like the numpy path
+    @njit(parallel=True, cache=True)
+    def _bin_mean(z, e, z0, inv_dz, n_layers, n_chunks):
+        """
+        One pass over the hits: layer index + scatter-add of E_dep and counts.
+        Each thread fills its own row, rows are reduced at the end (no races).
+        Index rule (shared with the bincount path): min(int((z-z0)*inv_dz), n_layers-1).
+        """
+        sums = np.zeros((n_chunks, n_layers))
+        counts = np.zeros((n_chunks, n_layers), np.int64)
+        chunk = (z.size + n_chunks - 1) // n_chunks
+        for c in prange(n_chunks):
+            lo = c * chunk
+            hi = min(lo + chunk, z.size)
+            for i in range(lo, hi):
+                k = int((z[i] - z0) * inv_dz)
+                if k >= n_layers:
+                    k = n_layers - 1
+                sums[c, k] += e[i]
+                counts[c, k] += 1
+        return sums.sum(axis=0), counts.sum(axis=0)
+
+
+def _call_bridge(particle: str, energy_mev: float, n_events: int, threads: Optional[int]) -> pd.DataFrame:
+    """The one place that talks to g4p.simulate_df (threads=None: leave the env as is)."""
+    if threads is not None:
+        # Geant4 MT: keep logs quiet & deterministic
+        os.environ["G4FORCENUMBEROFTHREADS"] = str(int(threads))
+    return g4p.simulate_df(str(particle), float(energy_mev), int(n_events))
+
 
 def _simulate_once_direct(
     particle: str,
@@ -20,15 +67,36 @@ def _simulate_once_direct(
     Direct call to the pybind bridge (no batching, no files).
     Returns a DataFrame with columns: event, edep_MeV, x_mm, y_mm, z_mm
     """
-    if threads is not None:
-        # Geant4 MT: keep logs quiet & deterministic
-        os.environ["G4FORCENUMBEROFTHREADS"] = str(int(threads))
-    df = g4p.simulate_df(str(particle), float(energy_mev), int(n_events))
+    df = _call_bridge(particle, energy_mev, n_events, threads)
     # ensure schema is stable
-    for col in ("event", "edep_MeV", "x_mm", "y_mm", "z_mm"):
+    for col in _HIT_COLUMNS:
         if col not in df.columns:
             df[col] = pd.NA
-    return df[["event", "edep_MeV", "x_mm", "y_mm", "z_mm"]]
+    return df[list(_HIT_COLUMNS)]
+
+
+def _simulate_once_arrays(
+    particle: str,
+    energy_mev: float,
+    n_events: int,
+    threads: Optional[int] = 1,
+) -> Dict[str, np.ndarray]:
+    """
+    Same call as _simulate_once_direct, but hands back one numpy array per hit
+    column (float32 for edep/x/y/z) instead of a re-indexed DataFrame.
+    Missing columns come back as NaN.
+    """
+    df = _call_bridge(particle, energy_mev, n_events, threads)
+    n = len(df)
+    out: Dict[str, np.ndarray] = {}
+    for col in _HIT_COLUMNS:
+        if col not in df.columns:
+            out[col] = np.full(n, np.nan, dtype=np.float32)
+        elif col in _FLOAT_COLUMNS:
+            out[col] = df[col].to_numpy(dtype=np.float32, copy=False, na_value=np.nan)
+        else:
+            out[col] = df[col].to_numpy(copy=False)
+    return out
 
 
 def run_parametric_sample_from_gd(
@@ -49,12 +117,9 @@ def run_parametric_sample_from_gd(
     several times, and concatenate results. No files, no run_batch.
     Adds 'E_MeV' per-chunk and stores 'layer_thick_cm' in df.attrs.
     """
-    if seed is not None:
-        random.seed(seed)
-
     n_events = int(n_events)
     if n_events <= 0:
-        return pd.DataFrame(columns=["event", "edep_MeV", "x_mm", "y_mm", "z_mm", "E_MeV"])
+        return pd.DataFrame(columns=list(_HIT_COLUMNS) + ["E_MeV"])
 
     # decide the call plan
     events_per_call = max(1, int(events_per_call))
@@ -64,23 +129,34 @@ def run_parametric_sample_from_gd(
     rem  = n_events %  n_calls
     plan: List[int] = [base + (1 if i < rem else 0) for i in range(n_calls)]
 
-    parts: List[pd.DataFrame] = []
+    # draw all energies up front from a local generator (no global RNG state)
+    rng = np.random.default_rng(seed)
+    energies_GeV = rng.uniform(float(e_min_GeV), float(e_max_GeV), size=n_calls)
+
+    # thread setting is the same for every chunk: apply it once, not per call
+    if threads is not None:
+        os.environ["G4FORCENUMBEROFTHREADS"] = str(int(threads))
+
+    # collect per-column arrays and build one DataFrame at the end
+    # (no per-chunk df.copy() + pd.concat)
+    cols: Dict[str, List[np.ndarray]] = {c: [] for c in _HIT_COLUMNS + ("E_MeV",)}
     for i, nev in enumerate(plan, start=1):
         if nev <= 0:
             continue
-        E_GeV = random.uniform(float(e_min_GeV), float(e_max_GeV))
+        E_GeV = float(energies_GeV[i - 1])
         E_MeV = E_GeV * 1000.0
         print(f"[{i}/{n_calls}] {particle} @ {E_GeV:.2f} GeV × {nev} events (threads={threads})")
-        df = _simulate_once_direct(particle, E_MeV, nev, threads=threads)
-        if not df.empty:
-            df = df.copy()
-            df["E_MeV"] = E_MeV
-            parts.append(df)
-
-    if parts:
-        out = pd.concat(parts, ignore_index=True)
+        arrays = _simulate_once_arrays(particle, E_MeV, nev, threads=None)
+        n_hits = arrays["event"].size
+        if n_hits:
+            for c in _HIT_COLUMNS:
+                cols[c].append(arrays[c])
+            cols["E_MeV"].append(np.full(n_hits, E_MeV, dtype=np.float32))
+
+    if cols["event"]:
+        out = pd.DataFrame({c: np.concatenate(v) for c, v in cols.items()})
     else:
-        out = pd.DataFrame(columns=["event", "edep_MeV", "x_mm", "y_mm", "z_mm", "E_MeV"])
+        out = pd.DataFrame(columns=list(_HIT_COLUMNS) + ["E_MeV"])
 
     out.attrs["layer_thick_cm"] = float(layer_thick_cm)
     return out
@@ -91,10 +167,14 @@ def plot_mean_bar(
     title: str = "Mean energy deposit per layer",
     layer_thick_cm: Optional[float] = None,
     ax: Optional[plt.Axes] = None,
+    show: bool = True,
+    tight: bool = True,
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
     Bin hits along z into layers of thickness = layer_thick_cm (cm), then plot mean
     E_dep per layer as a bar chart. Returns (layer_indices, mean_edep_per_layer).
+    For batch plotting pass show=False/tight=False (and reuse `ax`) so layout and
+    display are left to the caller.
     """
     if df.empty:
         print("plot_mean_bar: dataframe is empty; nothing to plot.")
@@ -102,17 +182,45 @@ def plot_mean_bar(
 
     if layer_thick_cm is None:
         layer_thick_cm = float(df.attrs.get("layer_thick_cm", 0.20))
-    dz_mm = float(layer_thick_cm) * 10.0
+    arrays = {"z_mm": df["z_mm"].to_numpy(), "edep_MeV": df["edep_MeV"].to_numpy()}
+    return plot_mean_bar_from_arrays(arrays, title, layer_thick_cm, ax=ax, show=show, tight=tight)
+
 
-    z = df["z_mm"].to_numpy(dtype=float)
-    e = df["edep_MeV"].to_numpy(dtype=float)
+def plot_mean_bar_from_arrays(
+    arrays: Dict[str, np.ndarray],
+    title: str = "Mean energy deposit per layer",
+    layer_thick_cm: float = 0.20,
+    ax: Optional[plt.Axes] = None,
+    show: bool = True,
+    tight: bool = True,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    plot_mean_bar for a dict of hit arrays (needs "z_mm" and "edep_MeV"), e.g.
+    straight from _simulate_once_arrays, without going through pandas.
+    """
+    # float32 is plenty for sim output and halves the bytes streamed per hit
+    z = np.asarray(arrays["z_mm"], dtype=np.float32)
+    e = np.asarray(arrays["edep_MeV"], dtype=np.float32)
+    if z.size == 0:
+        print("plot_mean_bar: no hits; nothing to plot.")
+        return np.array([]), np.array([])
+    dz_mm = float(layer_thick_cm) * 10.0
 
+    # z - z0 >= 0, so truncation == floor
     z0 = z.min()
-    layer_idx = np.floor((z - z0) / dz_mm).astype(int)
-    n_layers = int(layer_idx.max()) + 1
+    inv_dz = np.float32(1.0 / dz_mm)
+    n_layers = int((z.max() - z0) * inv_dz) + 1
 
-    sums = np.bincount(layer_idx, weights=e, minlength=n_layers).astype(float)
-    counts = np.bincount(layer_idx, minlength=n_layers).astype(float)
+    if _HAVE_NUMBA and z.size >= _NUMBA_MIN_HITS:
+        sums, counts = _bin_mean(z, e, z0, inv_dz, n_layers, get_num_threads())
+    else:
+        # intp is what bincount works in, so no hidden conversion copy;
+        # same clamp as _bin_mean so both paths bin identically
+        layer_idx = ((z - z0) * inv_dz).astype(np.intp)
+        np.minimum(layer_idx, n_layers - 1, out=layer_idx)
+        # same indices for both passes -> the second one runs out of cache
+        sums = np.bincount(layer_idx, weights=e, minlength=n_layers)
+        counts = np.bincount(layer_idx, minlength=n_layers)
     with np.errstate(invalid="ignore", divide="ignore"):
         means = np.where(counts > 0, sums / counts, 0.0)
 
@@ -124,7 +232,9 @@ def plot_mean_bar(
     ax.set_ylabel("⟨E_dep⟩ per hit [MeV]")
     ax.set_title(title)
     ax.grid(True, axis="y", alpha=0.3)
-    plt.tight_layout()
-    plt.show()
+    if tight:
+        plt.tight_layout()
+    if show:
+        plt.show()
 
     return x, means
@@ -1,6 +1,9 @@
-from dataclasses import dataclass, field
-from typing import Dict, List, Tuple
+import sys
+from dataclasses import dataclass
+from collections.abc import MutableMapping
+from typing import Dict, List, Tuple, Sequence, Optional, Iterator
 from math import pi
+import numpy as np
 
 # -----------------------------
 # Material price list (CHF/(cm·m^2))
@@ -36,6 +39,33 @@ X0_CM = {k: v["X0_cm"] for k, v in MATERIAL_PROP.items()}
 LAMBDA_INT_CM = {k: v["lambdaI_cm"] for k, v in MATERIAL_PROP.items()}
 
 
+# -----------------------------
+# Interned material index + per-material tables (used by CostTracker)
+# -----------------------------
+# Materials get a fixed integer id (new ones are appended, ids never move);
+# rate / X0 / λI live in arrays indexed by that id for the vectorized add_many.
+# COST_CHF_PER_CM_M2 / MATERIAL_PROP stay the source of truth: add() reads them
+# directly and add_many() refreshes the arrays from them on every call, so
+# edits to the public dicts take effect on the next add, as before.
+_MATS: List[str] = []
+MAT_IDX: Dict[str, int] = {}
+_RATES = np.zeros(0)
+_X0_ARR = np.zeros(0)
+_LAMBDA_I_ARR = np.zeros(0)
+
+def _rebuild_material_tables() -> None:
+    global _RATES, _X0_ARR, _LAMBDA_I_ARR
+    for m in MATERIAL_PROP:
+        if m in COST_CHF_PER_CM_M2 and m not in MAT_IDX:
+            MAT_IDX[m] = len(_MATS)
+            _MATS.append(sys.intern(m))
+    _RATES = np.array([COST_CHF_PER_CM_M2[m] for m in _MATS], dtype=np.float64)
+    _X0_ARR = np.array([MATERIAL_PROP[m]["X0_cm"] for m in _MATS], dtype=np.float64)
+    _LAMBDA_I_ARR = np.array([MATERIAL_PROP[m]["lambdaI_cm"] for m in _MATS], dtype=np.float64)
+
+_rebuild_material_tables()
+
+
 # -----------------------------
 # Transverse area helpers
 # -----------------------------
@@ -59,6 +89,81 @@ def cost_of_layer(thickness_cm: float, material: str, area_m2: float) -> float:
         raise KeyError(f"Unknown material for cost model: {material}") from e
     return float(thickness_cm) * float(area_m2) * rate
 
+# -----------------------------
+# Per-material views over the tracker arrays
+# -----------------------------
+# the four per-material accumulators; row k of CostTracker._seen belongs to _ACCS[k]
+_ACCS = ("_cm", "_chf", "_X0", "_lambdaI")
+
+class _MaterialView(MutableMapping):
+    """dict-like, write-through view of one CostTracker accumulator."""
+
+    def __init__(self, tracker: "CostTracker", acc: str):
+        self._tracker = tracker
+        self._acc = acc
+        self._row = _ACCS.index(acc)
+
+    def __getitem__(self, material: str) -> float:
+        idx = MAT_IDX.get(material)
+        if idx is None or idx >= self._tracker._cm.size or not self._tracker._seen[self._row, idx]:
+            raise KeyError(material)
+        return float(getattr(self._tracker, self._acc)[idx])
+
+    def __setitem__(self, material: str, value: float) -> None:
+        idx = self._tracker._index(material)
+        if idx >= self._tracker._cm.size:
+            self._tracker._grow()
+        getattr(self._tracker, self._acc)[idx] = float(value)
+        self._tracker._seen[self._row, idx] = True
+
+    def __delitem__(self, material: str) -> None:
+        self[material]  # KeyError if absent
+        idx = MAT_IDX[material]
+        getattr(self._tracker, self._acc)[idx] = 0.0
+        self._tracker._seen[self._row, idx] = False
+
+    def __iter__(self) -> Iterator[str]:
+        return (_MATS[i] for i in np.flatnonzero(self._tracker._seen[self._row]).tolist())
+
+    def __len__(self) -> int:
+        return int(self._tracker._seen[self._row].sum())
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    # dataclasses.asdict() deep-copies field values: hand back a plain dict
+    def __deepcopy__(self, memo) -> Dict[str, float]:
+        return dict(self)
+
+
+class _ByMaterial:
+    """
+    Field descriptor for CostTracker.by_material_*: the constructor argument
+    seeds the accumulator, reads return a _MaterialView over it.
+    """
+
+    def __init__(self, acc: str):
+        self._acc = acc
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return None  # dataclass field default
+        return _MaterialView(obj, self._acc)
+
+    def __set__(self, obj, value: Optional[Dict[str, float]]) -> None:
+        if "_cm" not in obj.__dict__:
+            obj._alloc()
+        if value is None:
+            return
+        items = list(value.items())  # snapshot first: value may be a view of this same array
+        row = _ACCS.index(self._acc)
+        getattr(obj, self._acc)[:] = 0.0
+        obj._seen[row] = False
+        view = _MaterialView(obj, self._acc)
+        for material, v in items:
+            view[material] = v
+
+
 # -----------------------------
 # Cost + X0/λI tracker
 # -----------------------------
@@ -71,15 +176,15 @@ class CostTracker:
       • total X0 and λI equivalents (both per material and totals)
 
     API stays the same:
-      add(), add_pair(), add_period(), summary(), pretty_print()
+      add(), add_many(), add_pair(), add_period(), summary(), pretty_print()
     """
     area_m2: float
 
-    # per-material accumulators
-    by_material_cm: Dict[str, float] = field(default_factory=dict)
-    by_material_chf: Dict[str, float] = field(default_factory=dict)
-    by_material_X0: Dict[str, float] = field(default_factory=dict)        # in units of X0
-    by_material_lambdaI: Dict[str, float] = field(default_factory=dict)   # in units of λI
+    # per-material accumulators (dict-like views over the arrays below)
+    by_material_cm: Dict[str, float] = _ByMaterial("_cm")
+    by_material_chf: Dict[str, float] = _ByMaterial("_chf")
+    by_material_X0: Dict[str, float] = _ByMaterial("_X0")            # in units of X0
+    by_material_lambdaI: Dict[str, float] = _ByMaterial("_lambdaI")  # in units of λI
 
     # totals
     total_length_cm: float = 0.0
@@ -87,14 +192,24 @@ class CostTracker:
     total_X0: float = 0.0
     total_lambdaI: float = 0.0
 
+    def _alloc(self) -> None:
+        # per-material accumulators, indexed by material id (MAT_IDX)
+        self._cm = np.zeros(len(_MATS))
+        self._chf = np.zeros(len(_MATS))
+        self._X0 = np.zeros(len(_MATS))
+        self._lambdaI = np.zeros(len(_MATS))
+        self._seen = np.zeros((len(_ACCS), len(_MATS)), dtype=bool)
+
     # --- configuration helpers ---
     def set_price(self, material: str, chf_per_cm_m2: float) -> None:
         """Override the price list entry."""
         COST_CHF_PER_CM_M2[material] = float(chf_per_cm_m2)
+        _rebuild_material_tables()
 
     def set_material_props(self, material: str, X0_cm: float, lambdaI_cm: float) -> None:
         """Override X0 and λI for a material (cm)."""
         MATERIAL_PROP[material] = {"X0_cm": float(X0_cm), "lambdaI_cm": float(lambdaI_cm)}
+        _rebuild_material_tables()
 
     # --- internal checks ---
     def _check_material(self, material: str) -> None:
@@ -103,13 +218,31 @@ class CostTracker:
         if material not in MATERIAL_PROP:
             raise KeyError(f"Missing MATERIAL_PROP entry for: {material}")
 
+    def _index(self, material: str) -> int:
+        try:
+            return MAT_IDX[material]
+        except KeyError:
+            # unknown name -> proper error, or a material added to the dicts directly
+            self._check_material(material)
+            _rebuild_material_tables()
+            return MAT_IDX[material]
+
+    def _grow(self) -> None:
+        # materials registered after this tracker was created
+        n = len(_MATS) - self._cm.size
+        if n > 0:
+            self._cm, self._chf, self._X0, self._lambdaI = (
+                np.concatenate([a, np.zeros(n)]) for a in (self._cm, self._chf, self._X0, self._lambdaI)
+            )
+            self._seen = np.concatenate([self._seen, np.zeros((len(_ACCS), n), dtype=bool)], axis=1)
+
     # --- accumulation API ---
     def add(self, material: str, thickness_cm: float, count: int = 1) -> None:
         """
         Add a homogeneous layer (or the same layer repeated).
         Example: add("G4_Pb", 0.15, count=96) → 96 layers of 1.5 mm Pb.
         """
-        self._check_material(material)
+        idx = self._index(material)
 
         tcm = float(thickness_cm) * int(count)
         chf = cost_of_layer(tcm, material, self.area_m2)
@@ -119,11 +252,15 @@ class CostTracker:
         x0_units = tcm / float(props["X0_cm"])
         li_units = tcm / float(props["lambdaI_cm"])
 
+        if idx >= self._cm.size:
+            self._grow()
+
         # per-material
-        self.by_material_cm[material] = self.by_material_cm.get(material, 0.0) + tcm
-        self.by_material_chf[material] = self.by_material_chf.get(material, 0.0) + chf
-        self.by_material_X0[material] = self.by_material_X0.get(material, 0.0) + x0_units
-        self.by_material_lambdaI[material] = self.by_material_lambdaI.get(material, 0.0) + li_units
+        self._cm[idx] += tcm
+        self._chf[idx] += chf
+        self._X0[idx] += x0_units
+        self._lambdaI[idx] += li_units
+        self._seen[:, idx] = True
 
         # totals
         self.total_length_cm += tcm
@@ -131,6 +268,39 @@ class CostTracker:
         self.total_X0 += x0_units
         self.total_lambdaI += li_units
 
+    def add_many(self, materials: Sequence[str], thicknesses_cm: Sequence[float]) -> None:
+        """
+        Add many layers at once (one material/thickness entry per layer).
+        Thicknesses are summed per material id first, then every accumulator is
+        updated with one vector add.
+        Example: add_many(["G4_Fe", "G4_POLYSTYRENE"] * 50, np.tile([1.5, 0.5], 50)).
+        """
+        idx = np.fromiter((self._index(m) for m in materials), dtype=np.intp)
+        t_arr = np.asarray(thicknesses_cm, dtype=np.float64).ravel()
+        if idx.size == 0:
+            return
+        # pick up any edits made to the public price / property dicts
+        _rebuild_material_tables()
+        n = len(_MATS)
+        if n > self._cm.size:
+            self._grow()
+        sums = np.bincount(idx, weights=t_arr, minlength=n)
+
+        chf = sums * float(self.area_m2) * _RATES
+        x0_units = sums / _X0_ARR
+        li_units = sums / _LAMBDA_I_ARR
+
+        self._cm += sums
+        self._chf += chf
+        self._X0 += x0_units
+        self._lambdaI += li_units
+        self._seen[:, idx] = True
+
+        self.total_length_cm += float(sums.sum())
+        self.total_cost_chf += float(chf.sum())
+        self.total_X0 += float(x0_units.sum())
+        self.total_lambdaI += float(li_units.sum())
+
     def add_pair(self, layers: Tuple[str, float, str, float], count: int = 1) -> None:
         """
         Add (absorber + scint) as one “period”, repeated.
@@ -145,29 +315,25 @@ class CostTracker:
         period = [("G4_Fe", 0.20), ("G4_POLYSTYRENE", 0.10), ...]
         ct.add_period(period, count=200)
         """
-        for _ in range(int(count)):
-            for mat, tcm in spec:
-                self.add(mat, tcm, count=1)
+        if not spec or int(count) <= 0:
+            return
+        mats, thicks = zip(*spec)
+        self.add_many(list(mats) * int(count), np.tile(np.asarray(thicks, dtype=np.float64), int(count)))
 
     # --- reporting ---
     def summary(self) -> Dict:
-        mats = sorted(set().union(
-            self.by_material_cm.keys(),
-            self.by_material_chf.keys(),
-            self.by_material_X0.keys(),
-            self.by_material_lambdaI.keys()
-        ))
+        ids = sorted(np.flatnonzero(self._seen.any(axis=0)).tolist(), key=lambda i: _MATS[i])
         by_mat = {
-            m: {
-                "total_cm": self.by_material_cm.get(m, 0.0),
-                "total_X0": self.by_material_X0.get(m, 0.0),
-                "total_lambdaI": self.by_material_lambdaI.get(m, 0.0),
-                "total_cost_chf": self.by_material_chf.get(m, 0.0),
-                "price_chf_per_cm_m2": COST_CHF_PER_CM_M2[m],
-                "X0_cm": MATERIAL_PROP[m]["X0_cm"],
-                "lambdaI_cm": MATERIAL_PROP[m]["lambdaI_cm"],
+            _MATS[i]: {
+                "total_cm": float(self._cm[i]),
+                "total_X0": float(self._X0[i]),
+                "total_lambdaI": float(self._lambdaI[i]),
+                "total_cost_chf": float(self._chf[i]),
+                "price_chf_per_cm_m2": COST_CHF_PER_CM_M2[_MATS[i]],
+                "X0_cm": MATERIAL_PROP[_MATS[i]]["X0_cm"],
+                "lambdaI_cm": MATERIAL_PROP[_MATS[i]]["lambdaI_cm"],
             }
-            for m in mats
+            for i in ids
         }
         return {
             "area_m2": self.area_m2,
@@ -196,3 +362,4 @@ class CostTracker:
         print(f"TOTAL X0:     {s['total_X0']:.2f}")
         print(f"TOTAL λI:     {s['total_lambdaI']:.2f}")
         print(f"TOTAL cost:   {s['total_cost_chf']:.2f} CHF")
+
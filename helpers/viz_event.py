@@ -1,7 +1,9 @@
 # viz_event.py (or just put this in a notebook cell)
 from typing import Dict, Tuple, Optional
 import math
+import numpy as np
 import matplotlib.pyplot as plt
+import matplotlib.colors as mc
 from matplotlib.patches import Rectangle
 
 # Material → color map (tweak as you like)
@@ -15,22 +17,23 @@ MAT_COLOR: Dict[str, str] = {
     "G4_PbWO4":       "#ffd92f",
 }
 
-def _layer_edges_mm(gd) -> Tuple[list, list, list]:
+# parsed once at import, so drawing never re-parses hex strings per layer
+MAT_RGBA: Dict[str, Tuple[float, float, float, float]] = {k: mc.to_rgba(v) for k, v in MAT_COLOR.items()}
+_DEFAULT_RGBA = mc.to_rgba("#cccccc")
+
+def _layer_edges_mm(gd) -> Tuple[np.ndarray, np.ndarray, list]:
     """
     Return (z_edges_mm, z_centers_mm, layer_info) where:
-      - z_edges_mm: cumulative z boundaries in mm
-      - z_centers_mm: center z of each layer (mm)
+      - z_edges_mm: cumulative z boundaries in mm (array, n_layers + 1)
+      - z_centers_mm: center z of each layer (mm, array)
       - layer_info: list of (thickness_mm, material, sensitive)
     """
-    z = 0.0
-    edges = [0.0]
-    info = []
-    for L in gd.layers:
-        t_mm = float(L.thickness_cm) * 10.0
-        info.append((t_mm, L.material, bool(L.sensitive)))
-        z += t_mm
-        edges.append(z)
-    centers = [(edges[i] + edges[i+1]) * 0.5 for i in range(len(edges)-1)]
+    t_mm = gd.thickness_cm * 10.0
+    edges = np.empty(t_mm.size + 1)
+    edges[0] = 0.0
+    np.cumsum(t_mm, out=edges[1:])
+    centers = (edges[:-1] + edges[1:]) * 0.5
+    info = list(zip(t_mm.tolist(), gd.materials, gd.sensitive.tolist()))
     return edges, centers, info
 
 def display_event(
@@ -41,8 +44,11 @@ def display_event(
     threads: int = 1,
     *,
     show_hits: bool = True,
+    hexbin_above: Optional[int] = None,
     figsize: Tuple[int, int] = (10, 6),
     title: Optional[str] = None,
+    show: bool = True,
+    tight: bool = True,
 ):
     """
     Visualize the layered geometry along z and (optionally) one event's hits.
@@ -61,14 +67,27 @@ def display_event(
         G4 threads (1 keeps logs quieter)
     show_hits : bool
         If True, try to import g4python and overlay hits
+    hexbin_above : int | None
+        Opt-in: above this many hits, draw an E_dep-weighted hexbin instead of
+        the scatter (draw cost ~ grid size, not hit count). None = always scatter
     figsize : (w, h)
         Figure size
     title : str | None
         Figure title override
+    show : bool
+        Call plt.show() at the end (set False in batch loops)
+    tight : bool
+        Run tight_layout() (set False in batch loops; it re-solves the layout)
+
+    Returns
+    -------
+    matplotlib.figure.Figure | None
+        The figure when show=False (for batch callers), else None so notebooks
+        don't render it a second time.
     """
     # Build geometry view (z in mm)
     z_edges, z_centers, layer_info = _layer_edges_mm(gd)
-    total_z = z_edges[-1] if z_edges else 0.0
+    total_z = float(z_edges[-1])
 
     fig, (ax_geom, ax_hits) = plt.subplots(
         2, 1, figsize=figsize, gridspec_kw={"height_ratios": [1, 1.2]}
@@ -81,25 +100,23 @@ def display_event(
     ax_geom.set_xlabel("z [mm]")
     ax_geom.set_title(title or f"Geometry & event display — {particle} @ {energy_GeV:g} GeV")
 
-    # draw layers as horizontal bars (single row, y from 0→1)
-    for i, (t_mm, mat, sens) in enumerate(layer_info):
-        z0 = z_edges[i]
-        color = MAT_COLOR.get(mat, "#cccccc")
-        hatch = "////" if sens else None
-        rect = Rectangle((z0, 0.1), t_mm, 0.8, facecolor=color, edgecolor="black", hatch=hatch, linewidth=0.6)
-        ax_geom.add_patch(rect)
-
-    # minimal legend (unique materials)
-    seen = {}
-    for _, mat, sens in layer_info:
-        key = (mat, sens)
-        if key not in seen:
-            seen[key] = (MAT_COLOR.get(mat, "#cccccc"), sens)
-    # build legend handles
+    # draw layers as horizontal bars (single row, y from 0→1): one collection
+    # per hatch style instead of one Rectangle artist per layer
+    for sflag, hatch in ((False, None), (True, "////")):
+        sel = [i for i, (_, _, sens) in enumerate(layer_info) if sens == sflag]
+        if sel:
+            ax_geom.broken_barh(
+                [(z_edges[i], layer_info[i][0]) for i in sel], (0.1, 0.8),
+                facecolors=np.array([MAT_RGBA.get(layer_info[i][1], _DEFAULT_RGBA) for i in sel]),
+                edgecolor="black", hatch=hatch, linewidth=0.6,
+            )
+
+    # minimal legend (unique materials, first-seen order)
+    seen = dict.fromkeys((mat, sens) for _, mat, sens in layer_info)
     handles = []
     labels = []
-    for (mat, sens), (c, sflag) in seen.items():
-        patch = Rectangle((0,0), 1, 1, facecolor=c, edgecolor="black", hatch=("////" if sflag else None))
+    for mat, sflag in seen:
+        patch = Rectangle((0,0), 1, 1, facecolor=MAT_RGBA.get(mat, _DEFAULT_RGBA), edgecolor="black", hatch=("////" if sflag else None))
         handles.append(patch)
         labels.append(f"{mat}" + (" (sensitive)" if sflag else ""))
     if handles:
@@ -125,22 +142,35 @@ def display_event(
 
     if df is not None and len(df):
         # radius vs z with bubble area ~ E_dep
-        import numpy as np
-        z = df["z_mm"].to_numpy()
-        x = df["x_mm"].to_numpy()
-        y = df["y_mm"].to_numpy()
-        e = df["edep_MeV"].to_numpy()
+        # float32 is ample for hit coordinates and halves the temporaries below
+        z = df["z_mm"].to_numpy(dtype=np.float32, copy=False)
+        x = df["x_mm"].to_numpy(dtype=np.float32, copy=False)
+        y = df["y_mm"].to_numpy(dtype=np.float32, copy=False)
+        e = df["edep_MeV"].to_numpy(dtype=np.float32, copy=False)
 
         r = np.sqrt(x*x + y*y)
-        # marker size scaling: a gentle function of edep (MeV)
-        s = np.clip(e, 0, np.percentile(e, 95))  # clip long tail for visibility
-        s = 10.0 + 60.0 * (s / (s.max() if s.max() > 0 else 1.0))
+        if hexbin_above is not None and z.size > hexbin_above:
+            hb = ax_hits.hexbin(z, r, C=e, reduce_C_function=np.sum, gridsize=(200, 50),
+                                extent=(0, max(total_z, 1.0), 0, float(r.max()) or 1.0),
+                                mincnt=1, rasterized=True)
+            # colorbar in an inset outside the panel, so ax_hits keeps the same
+            # z extent as the geometry panel above it
+            cax = ax_hits.inset_axes([1.01, 0.0, 0.015, 1.0])
+            fig.colorbar(hb, cax=cax, label="ΣE_dep [MeV]")
+        else:
+            # marker size scaling: a gentle function of edep (MeV)
+            s = np.clip(e, 0, np.percentile(e, 95))  # clip long tail for visibility
+            s = 10.0 + 60.0 * (s / (s.max() if s.max() > 0 else 1.0))
 
-        ax_hits.scatter(z, r, s=s, alpha=0.5, linewidths=0, label="hits")
-        ax_hits.legend(loc="upper right")
+            # rasterize the points only: axes/labels stay vector in PDF/SVG exports
+            ax_hits.scatter(z, r, s=s, alpha=0.5, linewidths=0, label="hits", rasterized=True)
+            ax_hits.legend(loc="upper right")
     else:
         ax_hits.text(0.02, 0.95, "No hits to plot", transform=ax_hits.transAxes,
                      va="top", ha="left", fontsize=9, color="gray")
 
-    plt.tight_layout()
-    plt.show()
+    if tight:
+        fig.tight_layout()
+    if show:
+        plt.show()
+    return None if show else fig